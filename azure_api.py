@@ -1,20 +1,93 @@
+import asyncio
 import logging
 import os
-from typing import List
+import random
+import time
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only required for AsyncAzureAPI
+    aiohttp = None
 
 MAX_AZURE_API_RETRIES = 3
 INVOKE_REST_API_TIMEOUT_SECONDS = 30
+MAX_RETRY_BACKOFF_SECONDS = 30
 AZURE_API_DOWNLOAD_TIMEOUT_SECONDS = 600
+AZURE_API_DOWNLOAD_CHUNK_SIZE = 1 << 20
+BUILDS_CACHE_TTL_SECONDS = 5
+BRANCH_CACHE_TTL_SECONDS = 300
+AZURE_API_POOL_CONNECTIONS = 10
+AZURE_API_POOL_MAXSIZE = 20
+MAX_CONCURRENT_BRANCH_LOOKUPS = 16
+EXPAND_ARTIFACTS_PARAMS = {"$expand": "artifacts"}
+ASYNC_AZURE_API_CONNECTION_LIMIT = 32
+ASYNC_AZURE_API_DNS_CACHE_TTL_SECONDS = 300
+ASYNC_ARTIFACT_PROBE_WINDOW_SIZE = 16
+
+
+class _AzureServerError(Exception):
+    """Raised for 5xx responses so both clients retry them like network errors"""
 
 
 class AzureAPI():
-    def __init__(self, organization, project, log=logging, retries=MAX_AZURE_API_RETRIES, , headers={}):
+    def __init__(self, organization, project, log=logging, retries=MAX_AZURE_API_RETRIES, headers={},
+                 builds_cache_ttl=BUILDS_CACHE_TTL_SECONDS):
         self.base_url = f"https://dev.azure.com/{organization}/{project}/_apis"
         self.base_params = {"api-version": "5.1"}
-        self.headers = { 'Content-Type': 'application/json' }
+        # read-only view passed as-is on requests without extra params, skipping the merge in __run_request
+        self._default_params = MappingProxyType(self.base_params)
+        self.headers = {'Content-Type': 'application/json', **headers}
         self.log = log
         self.retries = retries
+        # single pooled session so repeated calls to dev.azure.com reuse keep-alive connections
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount("https://", HTTPAdapter(pool_connections=AZURE_API_POOL_CONNECTIONS,
+                                                    pool_maxsize=AZURE_API_POOL_MAXSIZE,
+                                                    max_retries=0))
+        # downloads get their own pool whose adapter retries, __run_request retries the REST calls itself
+        self._download_session = requests.Session()
+        self._download_session.headers.update(self.headers)
+        self._download_session.mount("https://", HTTPAdapter(max_retries=Retry(
+            total=retries,
+            backoff_factor=1.0,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False)))
+        # repositories and definitions are kept with their ETag and revalidated with conditional GETs,
+        # existing branches are kept for BRANCH_CACHE_TTL_SECONDS
+        self._repo_cache: Dict[str, Tuple[str, dict]] = {}
+        self._definition_cache: Dict[str, Tuple[str, dict]] = {}
+        self._branch_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+        # build lists change often, so they are only shared between lookups made within a few seconds
+        self.builds_cache_ttl = builds_cache_ttl
+        self._builds_cache: Dict[tuple, Tuple[float, list]] = {}
+
+    def invalidate_cache(self):
+        self._repo_cache.clear()
+        self._definition_cache.clear()
+        self._branch_cache.clear()
+
+    def clear_builds_cache(self):
+        self._builds_cache.clear()
+
+    def close(self):
+        self._session.close()
+        self._download_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def get_artifact_for_repo_and_branch(self,
                                          artifact_name: str,
@@ -41,7 +114,12 @@ class AzureAPI():
             branch = f"refs/pull/{pr['pullRequestId']}/merge"
             build_version_prefix = ""
         top_builds = self.get_top_n_builds_for_repo_and_branch(repo_id, branch, is_pr, top_n_builds_to_check,
-                                                               build_version_prefix or "")
+                                                               build_version_prefix or "",
+                                                               extra_params=EXPAND_ARTIFACTS_PARAMS)
+        expanded_result = self._find_expanded_artifact(top_builds, artifact_name)
+        if expanded_result is not None:
+            return expanded_result
+        # server ignored the expand, fall back to querying each build's artifacts
         for build in top_builds:
             artifact = self.get_artifact_details(build['id'], artifact_name)
             if artifact:
@@ -51,7 +129,10 @@ class AzureAPI():
     def get_repository_by_name(self, name):
         if not name:
             raise ValueError(f"Cannot get repository by name for - {name}")
-        return self._run_get_request(f"git/repositories/{name}")
+        repo = self._cached_without_etag(self._repo_cache, name)
+        if repo is not None:
+            return repo
+        return self._run_get_request(f"git/repositories/{name}", etag_cache=self._repo_cache, cache_key=name)
 
     def get_pull_request_id_by_branch(self, repo_id: str, branch: str):
         if not branch or branch == 'master':
@@ -68,16 +149,48 @@ class AzureAPI():
 
     def get_top_n_builds_for_repo_and_branch(self, repo_id: str, branch: str = "master", is_pr: bool = False,
                                              n: int = 1,
-                                             build_number: str = ""):
+                                             build_number: str = "",
+                                             extra_params: dict = None):
         if not repo_id:
             raise ValueError(f"Invalid repo id - {repo_id}")
+        cache_key = self._builds_cache_key(repo_id, branch, is_pr, n, build_number, extra_params)
+        cached_builds = self._get_cached_builds(cache_key)
+        if cached_builds is not None:
+            return cached_builds
+        params = self._top_n_builds_params(repo_id, branch, is_pr, n, build_number)
+        params.update(extra_params or {})
+        builds = self._run_get_request("build/builds", params=params)
+        if not builds.get('value'):
+            raise Exception(f"No builds for given parameters | branch: {branch} | repo: {repo_id}")
+        self._cache_builds(cache_key, builds['value'])
+        return builds['value']
+
+    @staticmethod
+    def _builds_cache_key(repo_id: str, branch: str, is_pr: bool, n: int, build_number: str,
+                          extra_params: dict = None) -> tuple:
+        return repo_id, branch, is_pr, n, build_number, tuple(sorted((extra_params or {}).items()))
 
+    def _get_cached_builds(self, cache_key: tuple):
+        if cache_key not in self._builds_cache:
+            return None
+        timestamp, builds = self._builds_cache[cache_key]
+        if time.monotonic() - timestamp >= self.builds_cache_ttl:
+            self._builds_cache.pop(cache_key, None)
+            return None
+        return builds
+
+    def _cache_builds(self, cache_key: tuple, builds: list):
+        if self.builds_cache_ttl and self.builds_cache_ttl > 0:
+            self._builds_cache[cache_key] = (time.monotonic(), builds)
+
+    @staticmethod
+    def _top_n_builds_params(repo_id: str, branch: str, is_pr: bool, n: int, build_number: str) -> dict:
         reason_filter = 'pullRequest' if is_pr else 'batchedCI,manual,individualCI'
         status_filter = 'active' if is_pr else 'completed'
         branch_name = branch if is_pr else f"refs/heads/{branch}"
         result_filter = '' if is_pr else 'succeeded,partiallySucceeded'
 
-        builds = self._run_get_request("build/builds", params={
+        return {
             "reasonFilter": reason_filter,
             "statusFilter": status_filter,
             "resultFilter": result_filter,
@@ -87,10 +200,21 @@ class AzureAPI():
             "repositoryType": "TfsGit",
             "queryOrder": "finishTimeDescending",
             "buildNumber": f"{build_number}*"
-        })
-        if not builds.get('value'):
-            raise Exception(f"No builds for given parameters | branch: {branch} | repo: {repo_id}")
-        return builds['value']
+        }
+
+    @staticmethod
+    def _find_expanded_artifact(builds: List[dict], artifact_name: str):
+        """
+        Looks up the artifact in builds fetched with EXPAND_ARTIFACTS_PARAMS.
+        Returns None when the server did not expand the artifacts, so the caller can fall back to per build queries.
+        """
+        if not all('artifacts' in build for build in builds):
+            return None
+        for build in builds:
+            for artifact in build['artifacts'] or []:
+                if artifact.get('name') == artifact_name:
+                    return build['buildNumber'].split('-')[0], artifact['resource']['downloadUrl']
+        return None, None
 
     def get_artifact_details(self, build_id: str, artifact_name: str):
         if not build_id:
@@ -102,7 +226,24 @@ class AzureAPI():
     def get_branch_by_name(self, repo_id: str, branch_name: str):
         if not branch_name:
             raise ValueError("Branch name cannot be empty")
-        return self._run_get_request(f"git/repositories/{repo_id}/refs", params={'filter': f'heads/{branch_name}'})
+        key = (repo_id, branch_name)
+        if key in self._branch_cache:
+            timestamp, branch = self._branch_cache[key]
+            if time.monotonic() - timestamp < BRANCH_CACHE_TTL_SECONDS:
+                return branch
+            self._branch_cache.pop(key, None)
+        branch = self._run_get_request(f"git/repositories/{repo_id}/refs", params={'filter': f'heads/{branch_name}'})
+        # only existing branches are cached, a missing branch may be created at any moment
+        if branch is not None and branch.get('count', 0) > 0:
+            self._branch_cache[key] = (time.monotonic(), branch)
+        return branch
+
+    def _invalidate_branch_cache(self, repo_id: str):
+        # lookups may have been keyed by repo name, so also drop names known to resolve to this repo id
+        repo_keys = {repo_id} | {name for name, (_, repo) in list(self._repo_cache.items())
+                                 if repo and repo.get('id') == repo_id}
+        for key in [key for key in list(self._branch_cache) if key[0] in repo_keys]:
+            self._branch_cache.pop(key, None)
 
     def read_file_from_repo(self, repo_id: str, path_to_file: str, branch_name: str = ''):
         if not path_to_file:
@@ -111,7 +252,9 @@ class AzureAPI():
                                                                                   'versionDescriptor.version': branch_name})
 
     def create_new_branch(self, repo_id: str, data: dict):
-        return self._run_post_request(f"git/repositories/{repo_id}/pushes", data=data)
+        res = self._run_post_request(f"git/repositories/{repo_id}/pushes", data=data)
+        self._invalidate_branch_cache(repo_id)
+        return res
 
     def create_pr(self, repo_id: str, source_branch_name: str, new_branch_name: str, title: str, description: str,
                   is_draft: bool = False):
@@ -123,8 +266,7 @@ class AzureAPI():
         return self._run_post_request(f"git/repositories/{repo_id}/pullrequests", data=data)
 
     def abandon_pr(self, repo_id, pr_id):
-        params = self.base_params.copy()
-        params['api-version'] = '6.1-preview.1'
+        params = {'api-version': '6.1-preview.1'}
         data = {"status": 'abandoned'}
         return self._run_patch_request(f"git/repositories/{repo_id}/pullrequests/{pr_id}", data=data, params=params)
 
@@ -133,11 +275,12 @@ class AzureAPI():
             "name": branch_name,
             "oldObjectId": branch_id,
             "newObjectId": "0000000000000000000000000000000000000000"}]
-        return self._run_post_request(f"git/repositories/{repo_id}/refs", data=data)
+        res = self._run_post_request(f"git/repositories/{repo_id}/refs", data=data)
+        self._invalidate_branch_cache(repo_id)
+        return res
 
     def queue_build(self, data: dict):
-        params = self.base_params.copy()
-        params['api-version'] = '6.0'
+        params = {'api-version': '6.0'}
         return self._run_post_request(f"build/builds", data=data, params=params)
 
     def get_build_by_id(self, definition_id):
@@ -146,28 +289,25 @@ class AzureAPI():
     def get_definition_by_name(self, name: str):
         if not name:
             raise ValueError(f"Definition name cannot be empty")
-        return self._run_get_request(f"build/definitions", params={'name': name})
+        definition = self._cached_without_etag(self._definition_cache, name)
+        if definition is not None:
+            return definition
+        return self._run_get_request(f"build/definitions", params={'name': name},
+                                     etag_cache=self._definition_cache, cache_key=name)
 
-    @staticmethod
-    def download_artifact(url: str, download_path: str, log=None, retries: int = 3):
-        res = None
-        retry = 0
-        while retry < retries:
-            retry += 1
-            if log and retry > 1:
-                log.info(AzureAPI, f"Retry download artifact #{retry}")
-            res = requests.get(url,
-                               headers=self.headers,
-                               timeout=AZURE_API_DOWNLOAD_TIMEOUT_SECONDS,
-                               allow_redirects=True)
-            if res.status_code == definitions.AZURE_GET_SUCCESS_CODE:
-                break
-        if not res:
-            raise TimeoutError("Failed to download artifact")
-        if res.status_code != definitions.AZURE_GET_SUCCESS_CODE:
-            raise Exception(res.text)
-        zip_path = os.path.join(download_path, "artifact.zip")
-        open(zip_path, 'wb').write(res.content)
+    def download_artifact(self, url: str, download_path: str):
+        res = self._download_session.get(url,
+                                         stream=True,
+                                         timeout=AZURE_API_DOWNLOAD_TIMEOUT_SECONDS,
+                                         allow_redirects=True)
+        with res:
+            if res.status_code != requests.codes.ok:
+                raise Exception(res.text)
+            zip_path = os.path.join(download_path, "artifact.zip")
+            # stream to disk so peak memory stays at one chunk instead of the whole artifact
+            with open(zip_path, 'wb') as zip_file:
+                for chunk in res.iter_content(chunk_size=AZURE_API_DOWNLOAD_CHUNK_SIZE):
+                    zip_file.write(chunk)
         return zip_path
 
     def get_repos_contains_branch(self, relevant_repos: List[str], branch_name: str) -> List[str]:
@@ -180,49 +320,287 @@ class AzureAPI():
         Returns:
             List of repo names.
         """
-        repos_with_branch_name = []
-        for supported_repo in relevant_repos:
-            response = self.get_branch_by_name(supported_repo, branch_name)
-            if response is not None and response['count'] > 0:
-                repos_with_branch_name.append(supported_repo)
-        return repos_with_branch_name
-     
-     def __run_request(self, request_type: requests.api, url: str, as_json: bool = True, params: dict = None,
-                      data: dict = None):
+        if not relevant_repos:
+            return []
+        # pool_maxsize must cover max_workers, otherwise threads block waiting for a free connection
+        max_workers = min(MAX_CONCURRENT_BRANCH_LOOKUPS, AZURE_API_POOL_MAXSIZE, len(relevant_repos))
+        found_repos = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.get_branch_by_name, supported_repo, branch_name): supported_repo
+                       for supported_repo in relevant_repos}
+            for future in as_completed(futures):
+                response = future.result()
+                if response is not None and response['count'] > 0:
+                    found_repos.add(futures[future])
+        # keep the caller's repo order regardless of completion order
+        return [repo for repo in relevant_repos if repo in found_repos]
+
+    def __run_request(self, request_type, url: str, as_json: bool = True, params: dict = None,
+                      data: dict = None, etag_cache: dict = None, cache_key=None):
         request_args = {'url': f"{self.base_url}/{url}",
-                        'headers': self.base_headers,
                         'timeout': INVOKE_REST_API_TIMEOUT_SECONDS,
-                        'params': {**self.base_params, **(params or {})}}
+                        'params': self._merge_params(params)}
 
         if data:
-            request_args['data'] = jsons.dumps(data)
+            request_args['data'] = orjson.dumps(data)
+        # read once, the entry may be invalidated by another thread while the request is in flight
+        etag, cached = self._cached_entry(etag_cache, cache_key)
+        if etag:
+            request_args['headers'] = {'If-None-Match': etag}
         retry = 0
         while retry < self.retries:
             try:
                 res = request_type(**request_args)
-                # Verify request succeeded
-                if res.status_code == requests.codes.ok or res.status_code == requests.codes.created:
-                    if as_json:
-                        return jsons.loads(res.content.decode('utf-8'))
-                    else:
-                        return res.content
-                elif res.status_code >= HTTPResponseCode.INTERNAL_SERVER_ERROR:
-                    res.raise_for_status()
-                else:
-                    self.log.warn(f"Azure API responded with non OK status code | "
-                                  f"code - {res.status_code} | url - {url} | params - {params}")
-                    return None
-            except Exception as e:
+                return self._handle_response(res.status_code, res.headers, res.content, url, params, as_json,
+                                             (etag, cached), etag_cache, cache_key)
+            except (requests.RequestException, _AzureServerError) as e:
                 self.log.info(f"Exception occurred while trying to reach the server | {e}")
                 retry += 1
                 self.log.debug(f"Retry invoke REST-API from Azure url: {url}")
-                time.sleep(2 ** (retry + 1))
+                time.sleep(self._retry_backoff(retry))
+
+    def _handle_response(self, status: int, headers, content: bytes, url: str, params: dict, as_json: bool,
+                         etag_entry: tuple, etag_cache: dict = None, cache_key=None):
+        """
+        Status handling shared by the sync and async clients.
+        etag_entry is the (etag, cached body) pair the request was sent with.
+        """
+        etag, cached = etag_entry
+        # Verify request succeeded
+        if status == requests.codes.ok or status == requests.codes.created:
+            result = orjson.loads(content) if as_json else content
+            if etag_cache is not None:
+                etag_cache[cache_key] = (headers.get('ETag'), result)
+            return result
+        elif etag and status == requests.codes.not_modified:
+            return cached
+        elif status >= requests.codes.internal_server_error:
+            raise _AzureServerError(f"{status} Server Error for url: {url}")
+        else:
+            self.log.warn(f"Azure API responded with non OK status code | "
+                          f"code - {status} | url - {url} | params - {params}")
+            return None
 
-    def _run_get_request(self, url, params: dict = None, as_json: bool = True):
-        return self.__run_request(requests.get, url, as_json, params=params)
+    @staticmethod
+    def _cached_entry(etag_cache: dict, cache_key) -> tuple:
+        if etag_cache is None:
+            return None, None
+        return etag_cache.get(cache_key, (None, None))
+
+    @staticmethod
+    def _cached_without_etag(etag_cache: dict, cache_key):
+        # entries the server sent no ETag for cannot be revalidated, so they are served as-is
+        etag, value = etag_cache.get(cache_key, (None, None))
+        return value if etag is None else None
+
+    def _merge_params(self, params: dict = None):
+        if not params:
+            return self._default_params
+        return dict(self.base_params, **params)
+
+    @staticmethod
+    def _retry_backoff(retry: int) -> float:
+        # full jitter keeps clients throttled in the same window from retrying in lockstep
+        return random.uniform(0, min(2 ** retry, MAX_RETRY_BACKOFF_SECONDS))
+
+    def _run_get_request(self, url, params: dict = None, as_json: bool = True, etag_cache: dict = None,
+                         cache_key=None):
+        return self.__run_request(self._session.get, url, as_json, params=params, etag_cache=etag_cache,
+                                  cache_key=cache_key)
 
     def _run_post_request(self, url, params: dict = None, data=None, as_json: bool = True):
-        return self.__run_request(requests.post, url, as_json, params=params, data=data)
+        return self.__run_request(self._session.post, url, as_json, params=params, data=data)
 
     def _run_patch_request(self, url, params: dict = None, data: dict = None, as_json: bool = True):
-        return self.__run_request(requests.patch, url, as_json, params=params, data=data)
+        return self.__run_request(self._session.patch, url, as_json, params=params, data=data)
+
+
+class AsyncAzureAPI():
+    """
+    Resolves artifacts with concurrent requests over a single aiohttp session.
+    Wraps an AzureAPI (exposed as `api`) whose caches it shares; use it for the synchronous calls.
+    Release it with `async with` or `await aclose()`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncAzureAPI")
+        self.api = AzureAPI(*args, **kwargs)
+        self._aio_session = None
+        self._aio_loop = None
+
+    def _get_aio_session(self):
+        # created lazily since aiohttp sessions are bound to the event loop running when they are created
+        loop = asyncio.get_running_loop()
+        if self._aio_session is not None and self._aio_loop is not loop:
+            # e.g. one asyncio.run per call, the session of the previous (now closed) loop cannot be reused
+            self.api.log.debug("Event loop changed, recreating aiohttp session")
+            self._discard_aio_session()
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(limit=ASYNC_AZURE_API_CONNECTION_LIMIT,
+                                             ttl_dns_cache=ASYNC_AZURE_API_DNS_CACHE_TTL_SECONDS)
+            self._aio_session = aiohttp.ClientSession(connector=connector,
+                                                      headers=self.api.headers,
+                                                      timeout=aiohttp.ClientTimeout(
+                                                          total=INVOKE_REST_API_TIMEOUT_SECONDS))
+            self._aio_loop = loop
+        return self._aio_session
+
+    def _discard_aio_session(self):
+        """
+        Drops a session that cannot be awaited closed from here since its event loop is gone or not running.
+        Detaching keeps aiohttp from warning about it; the sockets went down with their loop.
+        """
+        if self._aio_session is not None and not self._aio_session.closed:
+            self._aio_session.detach()
+        self._aio_session = None
+        self._aio_loop = None
+
+    def close(self):
+        # the aiohttp session can only be awaited closed from its own running loop
+        loop = self._aio_loop
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            loop.create_task(self._aio_session.close())
+            self._aio_session = None
+            self._aio_loop = None
+        elif self._aio_session is not None and not self._aio_session.closed:
+            self.api.log.warning("AsyncAzureAPI closed outside its event loop, dropping the aiohttp session; "
+                                 "use 'await aclose()' to close it cleanly")
+            self._discard_aio_session()
+        self.api.close()
+
+    async def aclose(self):
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+            self._aio_loop = None
+        self.api.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def get_artifact_for_repo_and_branch(self,
+                                               artifact_name: str,
+                                               repository: str,
+                                               branch: str = 'master',
+                                               is_pr: bool = False,
+                                               build_version_prefix: str = "*",
+                                               top_n_builds_to_check=300):
+        repo_response_dict = await self.get_repository_by_name(repository)
+        repo_id = repo_response_dict['id']
+        # build branch name for pr
+        if is_pr:
+            pr = await self.get_pull_request_id_by_branch(repo_id, branch)
+            branch = f"refs/pull/{pr['pullRequestId']}/merge"
+            build_version_prefix = ""
+        top_builds = await self.get_top_n_builds_for_repo_and_branch(repo_id, branch, is_pr, top_n_builds_to_check,
+                                                                     build_version_prefix or "",
+                                                                     extra_params=EXPAND_ARTIFACTS_PARAMS)
+        expanded_result = self.api._find_expanded_artifact(top_builds, artifact_name)
+        if expanded_result is not None:
+            return expanded_result
+        # server ignored the expand, fall back to querying each build's artifacts
+        for start in range(0, len(top_builds), ASYNC_ARTIFACT_PROBE_WINDOW_SIZE):
+            build, artifact = await self._first_artifact_in_window(
+                top_builds[start:start + ASYNC_ARTIFACT_PROBE_WINDOW_SIZE], artifact_name)
+            if artifact:
+                return build['buildNumber'].split('-')[0], artifact['resource']['downloadUrl']
+        return None, None
+
+    async def _first_artifact_in_window(self, builds: List[dict], artifact_name: str):
+        """
+        Probes the builds concurrently and returns the first one in build order that holds the artifact.
+        Returns as soon as that build is known, cancelling the probes of the builds after it.
+        """
+        tasks = [asyncio.create_task(self.get_artifact_details(build['id'], artifact_name)) for build in builds]
+        try:
+            pending = set(tasks)
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # a hit only counts once every earlier build in the window is known to be a miss
+                for build, task in zip(builds, tasks):
+                    if not task.done():
+                        break
+                    artifact = task.result()
+                    if artifact:
+                        return build, artifact
+            return None, None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_repository_by_name(self, name):
+        if not name:
+            raise ValueError(f"Cannot get repository by name for - {name}")
+        repo = self.api._cached_without_etag(self.api._repo_cache, name)
+        if repo is not None:
+            return repo
+        return await self._arun_request("GET", f"git/repositories/{name}", etag_cache=self.api._repo_cache,
+                                        cache_key=name)
+
+    async def get_pull_request_id_by_branch(self, repo_id: str, branch: str):
+        if not branch or branch == 'master':
+            raise ValueError(f"invalid pr with source branch of '{branch}'")
+        res = await self._arun_request("GET", f"git/repositories/{repo_id}/pullrequests", {
+            "searchCriteria.status": "active",
+            "searchCriteria.sourceRefName": f"refs/heads/{branch}",
+            "$top": 1
+        })
+        if res['value']:
+            return res['value'][0]
+        else:
+            return None
+
+    async def get_top_n_builds_for_repo_and_branch(self, repo_id: str, branch: str = "master", is_pr: bool = False,
+                                                   n: int = 1,
+                                                   build_number: str = "",
+                                                   extra_params: dict = None):
+        if not repo_id:
+            raise ValueError(f"Invalid repo id - {repo_id}")
+        cache_key = self.api._builds_cache_key(repo_id, branch, is_pr, n, build_number, extra_params)
+        cached_builds = self.api._get_cached_builds(cache_key)
+        if cached_builds is not None:
+            return cached_builds
+        params = self.api._top_n_builds_params(repo_id, branch, is_pr, n, build_number)
+        params.update(extra_params or {})
+        builds = await self._arun_request("GET", "build/builds", params=params)
+        if not builds.get('value'):
+            raise Exception(f"No builds for given parameters | branch: {branch} | repo: {repo_id}")
+        self.api._cache_builds(cache_key, builds['value'])
+        return builds['value']
+
+    async def get_artifact_details(self, build_id: str, artifact_name: str):
+        if not build_id:
+            raise ValueError(f"Invalid build id - {build_id}")
+        if not artifact_name:
+            raise ValueError(f"Invalid artifact name - {artifact_name}")
+        return await self._arun_request("GET", f"build/builds/{build_id}/artifacts",
+                                        params={'artifactName': artifact_name})
+
+    async def _arun_request(self, method: str, url: str, params: dict = None, data: dict = None,
+                            as_json: bool = True, etag_cache: dict = None, cache_key=None):
+        request_args = {'url': f"{self.api.base_url}/{url}",
+                        'params': self.api._merge_params(params)}
+
+        if data:
+            request_args['data'] = orjson.dumps(data)
+        # read once, the entry may be invalidated while the request is in flight
+        etag, cached = self.api._cached_entry(etag_cache, cache_key)
+        if etag:
+            request_args['headers'] = {'If-None-Match': etag}
+        retry = 0
+        while retry < self.api.retries:
+            try:
+                async with self._get_aio_session().request(method, **request_args) as res:
+                    content = await res.read()
+                    return self.api._handle_response(res.status, res.headers, content, url, params, as_json,
+                                                     (etag, cached), etag_cache, cache_key)
+            except (aiohttp.ClientError, asyncio.TimeoutError, _AzureServerError) as e:
+                self.api.log.info(f"Exception occurred while trying to reach the server | {e}")
+                retry += 1
+                self.api.log.debug(f"Retry invoke REST-API from Azure url: {url}")
+                await asyncio.sleep(self.api._retry_backoff(retry))